@@ -0,0 +1,150 @@
+"""Alert rules evaluated incrementally on each miner result, with hysteresis."""
+
+from datetime import datetime
+from typing import Callable
+
+from config import (
+    ALERT_TEMP_MAX,
+    ALERT_TEMP_HYSTERESIS,
+    ALERT_HASHRATE_RATIO,
+    ALERT_HASHRATE_HYSTERESIS,
+    ALERT_FAN_MIN_RPM,
+    ALERT_FAN_HYSTERESIS,
+)
+from scanner import miner_key
+
+
+class AlertRule:
+    """
+    Threshold rule on one value derived from a miner dict.
+    With above=True the alert raises when value > trigger and clears when
+    value < clear; with above=False it raises when value < trigger and clears
+    when value > clear. A value of None (not reported) leaves the state as is.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        value: Callable[[dict], float | None],
+        trigger: float,
+        clear: float,
+        above: bool,
+        message: str,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.trigger = trigger
+        self.clear = clear
+        self.above = above
+        self.message = message
+
+    def next_state(self, value: float, active: bool) -> bool:
+        if self.above:
+            return value >= self.clear if active else value > self.trigger
+        return value <= self.clear if active else value < self.trigger
+
+
+def _metric(name: str) -> Callable[[dict], float | None]:
+    return lambda m: (m.get("metrics") or {}).get(name)
+
+
+def _hashrate_ratio(m: dict) -> float | None:
+    metrics = m.get("metrics") or {}
+    hashrate, expected = metrics.get("hashrate"), metrics.get("expected_hashrate")
+    if not m.get("is_mining", True) or hashrate is None or not expected:
+        return None
+    return hashrate / expected
+
+
+def default_rules() -> list[AlertRule]:
+    """Rules built from the ALERT_* settings in config."""
+    rules = [
+        AlertRule(
+            "overheat", _metric("temp_max"),
+            ALERT_TEMP_MAX, ALERT_TEMP_MAX - ALERT_TEMP_HYSTERESIS, True,
+            "Temp {value:.0f}C (limit " + f"{ALERT_TEMP_MAX:.0f}C)",
+        ),
+        AlertRule(
+            "low_hashrate", _hashrate_ratio,
+            ALERT_HASHRATE_RATIO, ALERT_HASHRATE_RATIO + ALERT_HASHRATE_HYSTERESIS, False,
+            "Hashrate at {value:.0%} of expected",
+        ),
+        AlertRule(
+            "not_mining", lambda m: 0.0 if m.get("is_mining", True) else 1.0,
+            0.5, 0.5, True,
+            "Not mining",
+        ),
+        AlertRule(
+            "errors", lambda m: float(len(m.get("errors") or [])),
+            0.5, 0.5, True,
+            "{value:.0f} error(s) reported",
+        ),
+    ]
+    if ALERT_FAN_MIN_RPM > 0:
+        rules.append(AlertRule(
+            "fan_slow", _metric("fan_min"),
+            ALERT_FAN_MIN_RPM, ALERT_FAN_MIN_RPM + ALERT_FAN_HYSTERESIS, False,
+            "Fan at {value:.0f} RPM",
+        ))
+    return rules
+
+
+class AlertEngine:
+    """
+    Tracks active alerts per miner. evaluate() costs O(rules) per miner result,
+    independent of fleet size. Not thread-safe on its own; SharedState
+    serializes access.
+    """
+
+    def __init__(self, rules: list[AlertRule] | None = None) -> None:
+        self.rules = rules if rules is not None else default_rules()
+        self._active: dict[str, dict[str, dict]] = {}
+        self.count = 0
+        self.revision = 0
+
+    def evaluate(self, miner: dict) -> None:
+        key = miner_key(miner)
+        active = self._active.get(key, {})
+        changed = False
+        for rule in self.rules:
+            value = rule.value(miner)
+            if value is None:
+                continue
+            was_active = rule.name in active
+            now_active = rule.next_state(value, was_active)
+            if now_active:
+                message = rule.message.format(value=value)
+                if not was_active or active[rule.name]["message"] != message:
+                    since = active[rule.name]["since"] if was_active else datetime.now().isoformat(timespec="seconds")
+                    active[rule.name] = {
+                        "key": key,
+                        "ip": miner.get("ip", ""),
+                        "rule": rule.name,
+                        "message": message,
+                        "since": since,
+                    }
+                    changed = True
+                    self.count += 0 if was_active else 1
+            elif was_active:
+                del active[rule.name]
+                self.count -= 1
+                changed = True
+        if active:
+            self._active[key] = active
+        else:
+            self._active.pop(key, None)
+        if changed:
+            self.revision += 1
+
+    def remove(self, key: str) -> None:
+        """Drop alerts of a miner that is no longer on the network."""
+        active = self._active.pop(key, None)
+        if active:
+            self.count -= len(active)
+            self.revision += 1
+
+    def for_miner(self, key: str) -> list[dict]:
+        return list(self._active.get(key, {}).values())
+
+    def all(self) -> list[dict]:
+        return [a for active in self._active.values() for a in active.values()]
@@ -5,21 +5,26 @@ import socket
 
 
 def get_default_subnet() -> str:
-    """Auto-detect subnet from Pi's interface (e.g., 192.168.1.x -> /24)."""
+    """Auto-detect subnet from Pi's interface (e.g., 192.168.1.x -> /24).
+
+    Reads the address of the interface holding the default route via a
+    connected UDP socket: no DNS lookup and no packets are sent.
+    """
     try:
-        hostname = socket.gethostname()
-        ip = socket.gethostbyname(hostname)
-        if ip and ip != "127.0.0.1":
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("10.255.255.255", 1))
+            ip = sock.getsockname()[0]
+        if ip and not ip.startswith("127.") and ip != "0.0.0.0":
             parts = ip.rsplit(".", 1)
             if len(parts) == 2:
                 return f"{parts[0]}.0/24"
-    except (socket.gaierror, socket.herror, OSError):
+    except OSError:
         pass
     return "192.168.1.0/24"
 
 
 # IP range for scanning; override via env MINER_SCANNER_SUBNET
-SUBNET = os.environ.get("MINER_SCANNER_SUBNET", get_default_subnet())
+SUBNET = os.environ.get("MINER_SCANNER_SUBNET") or get_default_subnet()
 
 # Whatsminer API password; override via env MINER_SCANNER_WHATSMINER_PASSWORD
 WHATSMINER_PASSWORD = os.environ.get("MINER_SCANNER_WHATSMINER_PASSWORD", "admin")
@@ -33,3 +38,29 @@ MIN_TOUCH_TARGET = 44
 
 # Web server port for scan results (default 80; port 80 requires root or setcap)
 WEB_PORT = int(os.environ.get("MINER_SCANNER_WEB_PORT", "80"))
+
+# NDJSON file recording the changes found by each scan; set empty to disable
+HISTORY_FILE = os.environ.get(
+    "MINER_SCANNER_HISTORY_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.ndjson"),
+)
+
+# Alert thresholds; an alert clears only once the value is back past the
+# threshold by the hysteresis margin, so readings near the limit do not flap
+ALERT_TEMP_MAX = float(os.environ.get("MINER_SCANNER_ALERT_TEMP_MAX", "85"))
+ALERT_TEMP_HYSTERESIS = float(os.environ.get("MINER_SCANNER_ALERT_TEMP_HYSTERESIS", "5"))
+# Alert when hashrate falls below this fraction of expected hashrate
+ALERT_HASHRATE_RATIO = float(os.environ.get("MINER_SCANNER_ALERT_HASHRATE_RATIO", "0.8"))
+ALERT_HASHRATE_HYSTERESIS = float(os.environ.get("MINER_SCANNER_ALERT_HASHRATE_HYSTERESIS", "0.05"))
+# Alert when any fan is slower than this (RPM); 0 disables (e.g. immersion cooling)
+ALERT_FAN_MIN_RPM = float(os.environ.get("MINER_SCANNER_ALERT_FAN_MIN_RPM", "500"))
+ALERT_FAN_HYSTERESIS = float(os.environ.get("MINER_SCANNER_ALERT_FAN_HYSTERESIS", "200"))
+
+# History file size (MB) at which it is rotated to <file>.1; at most two files are kept
+HISTORY_MAX_BYTES = int(float(os.environ.get("MINER_SCANNER_HISTORY_MAX_MB", "10")) * 1024 * 1024)
+
+# Seconds between automatic scans in headless mode (0 = only on request)
+SCAN_INTERVAL = int(os.environ.get("MINER_SCANNER_SCAN_INTERVAL", "0"))
+
+# Target time (ms) from process start to first GUI frame; exceeding it logs a warning
+STARTUP_BUDGET_MS = int(os.environ.get("MINER_SCANNER_STARTUP_BUDGET_MS", "1500"))
@@ -0,0 +1,110 @@
+"""Fleet-wide aggregates maintained incrementally as miner results arrive."""
+
+from collections import Counter
+
+from scanner import miner_key
+
+
+class FleetStats:
+    """
+    Running totals over the latest result of every miner.
+    update/remove cost O(1) (plus a rare rescan of distinct temperatures when
+    the hottest miner goes away); summary() does not touch individual miners.
+    Not thread-safe on its own; SharedState serializes access.
+    """
+
+    def __init__(self) -> None:
+        self._contrib: dict[str, dict] = {}
+        self.revision = 0
+        self.count = 0
+        self.hashrate = 0.0
+        self.expected_hashrate = 0.0
+        self.wattage = 0.0
+        # Hashrate/wattage of miners reporting both, for fleet efficiency
+        self._eff_count = 0
+        self._eff_hashrate = 0.0
+        self._eff_wattage = 0.0
+        self.not_mining = 0
+        self.by_make: Counter[str] = Counter()
+        self.by_model: Counter[str] = Counter()
+        self._temps: Counter[float] = Counter()
+        self._max_temp: float | None = None
+
+    @staticmethod
+    def _contribution(miner: dict) -> dict:
+        metrics = miner.get("metrics") or {}
+        return {
+            "hashrate": metrics.get("hashrate"),
+            "expected_hashrate": metrics.get("expected_hashrate"),
+            "wattage": metrics.get("wattage"),
+            "temp_max": metrics.get("temp_max"),
+            "not_mining": not miner.get("is_mining", True),
+            "make": miner.get("make") or "Unknown",
+            "model": miner.get("model") or "Unknown",
+        }
+
+    def _apply(self, c: dict, sign: int) -> None:
+        self.count += sign
+        self.hashrate += sign * (c["hashrate"] or 0.0)
+        self.expected_hashrate += sign * (c["expected_hashrate"] or 0.0)
+        self.wattage += sign * (c["wattage"] or 0.0)
+        if c["hashrate"] and c["wattage"]:
+            self._eff_count += sign
+            self._eff_hashrate += sign * c["hashrate"]
+            self._eff_wattage += sign * c["wattage"]
+        # Float sums drift as miners come and go; restart from exact zero when empty
+        if self.count == 0:
+            self.hashrate = self.expected_hashrate = self.wattage = 0.0
+        if self._eff_count == 0:
+            self._eff_hashrate = self._eff_wattage = 0.0
+        self.not_mining += sign * int(c["not_mining"])
+        for counter, name in ((self.by_make, c["make"]), (self.by_model, c["model"])):
+            counter[name] += sign
+            if counter[name] <= 0:
+                del counter[name]
+        temp = c["temp_max"]
+        if temp is None:
+            return
+        if sign > 0:
+            self._temps[temp] += 1
+            if self._max_temp is None or temp > self._max_temp:
+                self._max_temp = temp
+        else:
+            self._temps[temp] -= 1
+            if self._temps[temp] <= 0:
+                del self._temps[temp]
+                if temp == self._max_temp:
+                    self._max_temp = max(self._temps, default=None)
+
+    def update(self, miner: dict) -> None:
+        """Replace this miner's contribution with its latest result."""
+        key = miner_key(miner)
+        new = self._contribution(miner)
+        old = self._contrib.get(key)
+        if old == new:
+            return
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+        self._contrib[key] = new
+        self.revision += 1
+
+    def remove(self, key: str) -> None:
+        old = self._contrib.pop(key, None)
+        if old is not None:
+            self._apply(old, -1)
+            self.revision += 1
+
+    def summary(self) -> dict:
+        efficiency = self._eff_wattage / self._eff_hashrate if self._eff_count and self._eff_hashrate > 0 else None
+        return {
+            "miners": self.count,
+            "hashrate": round(self.hashrate, 2),
+            "expected_hashrate": round(self.expected_hashrate, 2),
+            "wattage": round(self.wattage, 1),
+            "efficiency": round(efficiency, 2) if efficiency is not None else None,
+            "not_mining": self.not_mining,
+            "max_temp": round(self._max_temp, 1) if self._max_temp is not None else None,
+            "by_make": dict(self.by_make),
+            "by_model": dict(self.by_model),
+        }
@@ -116,6 +116,11 @@ class ScrollableList:
         self.items = items
         self.scroll_offset = 0
 
+    def update_items(self, items: list[dict]) -> None:
+        """Replace items but keep the scroll position (clamped to the new length)."""
+        self.items = items
+        self.scroll_offset = min(self.scroll_offset, self.max_scroll())
+
     def max_scroll(self) -> int:
         total_h = len(self.items) * self.item_height
         visible = self.rect.h
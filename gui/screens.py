@@ -4,6 +4,7 @@ import pygame
 from datetime import datetime
 
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, MIN_TOUCH_TARGET
+from scanner import miner_key
 from gui.components import (
     Button,
     ScrollableList,
@@ -31,13 +32,16 @@ class Screen:
 
 
 class HomeScreen(Screen):
-    """Home: Scan button, last scan time, View Miners button."""
+    """Home: Scan button (Cancel while scanning), last scan time, View Miners button."""
 
-    def __init__(self, on_scan: callable):
+    def __init__(self, on_scan: callable, on_cancel: callable = None):
         self.on_scan = on_scan
+        self.on_cancel = on_cancel
         self.last_scan: str | None = None
         self.scanning = False
         self.miners: list[dict] = []
+        self.summary: dict | None = None
+        self.alert_count = 0
         btn_w = 120
         btn_h = max(MIN_TOUCH_TARGET, 50)
         self.scan_btn = Button(
@@ -68,10 +72,30 @@ class HomeScreen(Screen):
     def set_miners(self, miners: list[dict]) -> None:
         self.miners = miners
 
+    def set_summary(self, summary: dict) -> None:
+        """Fleet totals from FleetStats.summary()."""
+        self.summary = summary
+
+    def set_alert_count(self, count: int) -> None:
+        self.alert_count = count
+
+    def _summary_lines(self) -> list[str]:
+        s = self.summary
+        if not s or not s["miners"]:
+            return []
+        eff = f"{s['efficiency']} J/TH" if s["efficiency"] is not None else "-"
+        temp = f"{s['max_temp']:.0f}C" if s["max_temp"] is not None else "-"
+        return [
+            f"{s['hashrate']:.1f}/{s['expected_hashrate']:.1f} TH/s  {s['wattage']:.0f}W  {eff}",
+            f"Not mining: {s['not_mining']}/{s['miners']}  Max temp: {temp}",
+        ]
+
     def handle_event(self, event: pygame.event.Event) -> str | None:
         if self.scan_btn.handle_event(event):
             if not self.scanning:
                 self.on_scan()
+            elif self.on_cancel:
+                self.on_cancel()
             return None
         if self.miners and self.view_btn.handle_event(event):
             return "list"
@@ -82,7 +106,7 @@ class HomeScreen(Screen):
         title = self.title_font.render("Miner Scanner", True, FG)
         surface.blit(title, ((SCREEN_WIDTH - title.get_width()) // 2, 20))
         if self.scanning:
-            self.scan_btn.text = "Scanning..."
+            self.scan_btn.text = "Cancel" if self.on_cancel else "Scanning..."
             self.scan_btn.draw(surface)
             self.scan_btn.text = "Scan"
         else:
@@ -93,6 +117,12 @@ class HomeScreen(Screen):
         if self.last_scan:
             txt = self.font.render(f"Last scan: {self.last_scan}", True, FG)
             surface.blit(txt, ((SCREEN_WIDTH - txt.get_width()) // 2, SCREEN_HEIGHT // 2 + 70))
+        for i, line in enumerate(self._summary_lines()):
+            txt = self.font.render(line, True, FG)
+            surface.blit(txt, ((SCREEN_WIDTH - txt.get_width()) // 2, SCREEN_HEIGHT // 2 + 95 + i * 20))
+        if self.alert_count:
+            txt = self.font.render(f"Alerts: {self.alert_count}", True, ERROR_COLOR)
+            surface.blit(txt, (SCREEN_WIDTH - txt.get_width() - 10, 10))
 
 
 class MinerListScreen(Screen):
@@ -104,12 +134,29 @@ class MinerListScreen(Screen):
         self.on_back = on_back
         self.list = ScrollableList(0, 40, SCREEN_WIDTH, SCREEN_HEIGHT - 90, item_height=36)
         self.list.set_items(miners)
+        self._index = {miner_key(m): i for i, m in enumerate(miners)}
         self.back_btn = Button(10, 5, 80, max(MIN_TOUCH_TARGET, 30), "Back", font_size=14)
         self.font = get_font(14)
 
     def set_miners(self, miners: list[dict]) -> None:
         self.miners = miners
         self.list.set_items(miners)
+        self._index = {miner_key(m): i for i, m in enumerate(miners)}
+
+    def apply_diff(self, diff: dict) -> None:
+        """Apply a scanner.diff_miners result in place, keeping the scroll position."""
+        if diff["removed"]:
+            gone = {miner_key(m) for m in diff["removed"]}
+            self.miners = [m for m in self.miners if miner_key(m) not in gone]
+            self._index = {miner_key(m): i for i, m in enumerate(self.miners)}
+        for change in diff["changed"]:
+            idx = self._index.get(change["key"])
+            if idx is not None:
+                self.miners[idx] = change["miner"]
+        for m in diff["added"]:
+            self._index[miner_key(m)] = len(self.miners)
+            self.miners.append(m)
+        self.list.update_items(self.miners)
 
     def handle_event(self, event: pygame.event.Event) -> str | None:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -139,10 +186,19 @@ class MinerListScreen(Screen):
 class DetailScreen(Screen):
     """All miner data: IP, hostname, model, hashrate, temp, fans, workers, etc."""
 
-    def __init__(self, data: dict, on_back: callable):
+    def __init__(
+        self,
+        data: dict,
+        on_back: callable,
+        alerts: list[dict] | None = None,
+        on_refresh: callable = None,
+    ):
         self.data = data
+        self.alerts = alerts or []
         self.on_back = on_back
+        self.on_refresh = on_refresh
         self.back_btn = Button(10, 5, 80, max(MIN_TOUCH_TARGET, 30), "Back", font_size=14)
+        self.refresh_btn = Button(100, 5, 100, max(MIN_TOUCH_TARGET, 30), "Refresh", font_size=14)
         self.scroll = 0
         self.line_height = 16
         self.font = get_font(12)
@@ -150,8 +206,20 @@ class DetailScreen(Screen):
         self.up_rect = pygame.Rect(SCREEN_WIDTH - 52, 45, 44, 44)
         self.down_rect = pygame.Rect(SCREEN_WIDTH - 52, SCREEN_HEIGHT - 90, 44, 44)
 
+    def apply_diff(self, diff: dict) -> None:
+        """Show fresh data if the displayed miner changed in the latest scan."""
+        key = miner_key(self.data)
+        for change in diff["changed"]:
+            if change["key"] == key:
+                self.data = change["miner"]
+                self.scroll = min(self.scroll, self._max_scroll())
+                return
+
+    def set_alerts(self, alerts: list[dict]) -> None:
+        self.alerts = alerts
+
     def _build_lines(self) -> list[str]:
-        lines = []
+        lines = [f"Alert: {a['message']}" for a in self.alerts]
         d = self.data
         lines.append(f"IP: {d.get('ip', '')}")
         lines.append(f"Hostname: {d.get('hostname', '')}")
@@ -199,22 +267,28 @@ class DetailScreen(Screen):
             if self.back_btn.contains(event.pos):
                 self.on_back()
                 return "list"
+            if self.on_refresh and self.refresh_btn.contains(event.pos):
+                self.on_refresh()
+                return None
             if self.up_rect.collidepoint(event.pos) and self.scroll > 0:
                 self.scroll = max(0, self.scroll - 40)
             if self.down_rect.collidepoint(event.pos) and self.scroll < self._max_scroll():
                 self.scroll = min(self._max_scroll(), self.scroll + 40)
         if event.type == pygame.MOUSEMOTION:
             self.back_btn.hover = self.back_btn.contains(event.pos)
+            self.refresh_btn.hover = self.refresh_btn.contains(event.pos)
         return None
 
     def draw(self, surface: pygame.Surface) -> None:
         surface.fill(BG)
         self.back_btn.draw(surface)
+        if self.on_refresh:
+            self.refresh_btn.draw(surface)
         lines = self._build_lines()
         y = 45 - self.scroll
         for line in lines:
             if y + self.line_height > 40 and y < SCREEN_HEIGHT:
-                color = ERROR_COLOR if "Error" in line else FG
+                color = ERROR_COLOR if "Error" in line or line.startswith("Alert:") else FG
                 txt = self.font.render(line[:60], True, color)
                 surface.blit(txt, (10, y))
             y += self.line_height
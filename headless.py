@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Headless Miner Scanner daemon: runs the scanner and web server without a display.
+Never imports pygame, so it starts fast and runs on servers without a TFT.
+"""
+
+import argparse
+import signal
+import threading
+
+from config import SUBNET, WEB_PORT, SCAN_INTERVAL, HISTORY_FILE, HISTORY_MAX_BYTES
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Headless miner scanner with web interface.")
+    parser.add_argument("--subnet", default=SUBNET, help=f"IP range to scan (default: {SUBNET})")
+    parser.add_argument("--host", default="0.0.0.0", help="Web server bind address (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=WEB_PORT, help=f"Web server port (default: {WEB_PORT})")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=SCAN_INTERVAL,
+        help="Seconds between automatic scans; 0 scans only on request (default: %(default)s)",
+    )
+    parser.add_argument("--no-initial-scan", action="store_true", help="Do not scan on startup")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    # Imported here so `--help` stays instant; pygame is never imported.
+    from history import HistoryStore
+    from scan_queue import ScanJob
+    from web.server import run_server
+    from web.state import SharedState
+    from worker import start_scan_workers
+
+    shared_state = SharedState(history=HistoryStore(HISTORY_FILE, HISTORY_MAX_BYTES) if HISTORY_FILE else None)
+    stop = threading.Event()
+
+    def on_job_done(job: ScanJob, diff: dict | None) -> None:
+        target = job.ip or job.subnet or args.subnet
+        if diff is None:
+            print(f"Scan of {target} {job.status}", flush=True)
+            return
+        print(
+            f"Scan of {target} {job.status}: "
+            f"+{len(diff['added'])} -{len(diff['removed'])} ~{len(diff['changed'])}",
+            flush=True,
+        )
+
+    def on_signal(signum: int, frame: object) -> None:
+        stop.set()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    web_thread = threading.Thread(
+        target=run_server,
+        args=(shared_state,),
+        kwargs={"host": args.host, "port": args.port},
+        daemon=True,
+    )
+    web_thread.start()
+    print(f"Web server on http://{args.host}:{args.port}/", flush=True)
+    start_scan_workers(shared_state, args.subnet, on_done=on_job_done)
+
+    if not args.no_initial_scan:
+        shared_state.request_scan()
+    # Periodic sweeps; requests made while one is queued or running are coalesced
+    while not stop.wait(args.interval if args.interval > 0 else 3600):
+        if args.interval > 0:
+            shared_state.request_scan()
+
+
+if __name__ == "__main__":
+    main()
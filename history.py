@@ -0,0 +1,78 @@
+"""Append-only scan history: one NDJSON record per scan holding only what changed."""
+
+import json
+import os
+import threading
+from typing import Iterator
+
+from scanner import miner_key
+
+
+class HistoryStore:
+    """
+    Writes scan diffs to an NDJSON file (one line per scan with changes).
+    When the file reaches max_bytes it is rotated to <path>.1 (replacing the
+    previous one), so disk use stays below about twice max_bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        try:
+            self._size = os.path.getsize(path)
+        except OSError:
+            self._size = 0
+
+    def record(self, version: int, when: str, diff: dict) -> None:
+        """Append a diff produced by scanner.diff_miners.
+
+        Added miners are stored in full; removed and changed miners only by key
+        (and changed fields), so a record is proportional to what changed.
+        """
+        entry = {
+            "version": version,
+            "time": when,
+            "added": diff["added"],
+            "removed": [{"key": miner_key(m), "ip": m.get("ip", "")} for m in diff["removed"]],
+            "changed": [
+                {"key": c["key"], "ip": c["miner"].get("ip", ""), "fields": c["fields"]}
+                for c in diff["changed"]
+            ],
+        }
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            try:
+                if self._size and self._size + len(line) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                    self._size = 0
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                self._size += len(line)
+            except OSError:
+                pass
+
+    def iter_records(self, start: str | None = None, end: str | None = None) -> Iterator[dict]:
+        """
+        Yield records with start <= time <= end (ISO strings, any prefix such
+        as "2026-01" works), reading the rotated and current files one line
+        at a time.
+        """
+        for path in (self.path + ".1", self.path):
+            try:
+                f = open(path, encoding="utf-8")
+            except OSError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    when = record.get("time", "")
+                    if start and when < start:
+                        continue
+                    if end and when[:len(end)] > end:
+                        # No early exit: the Pi's clock may jump at boot (no RTC)
+                        continue
+                    yield record
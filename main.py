@@ -4,17 +4,22 @@ Miner Scanner GUI for Raspberry Pi 3.5" TFT LCD 480x320 SPI touchscreen.
 Scans LAN for ASIC miners (Whatsminer, Antminer, etc.) and displays all data.
 """
 
+import time
+
+_START = time.perf_counter()
+
 import os
 import sys
 import threading
-from datetime import datetime
 
 import pygame
 
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, SUBNET, WEB_PORT
-from scanner import run_scan
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, SUBNET, WEB_PORT, STARTUP_BUDGET_MS, HISTORY_FILE, HISTORY_MAX_BYTES
 from gui.screens import HomeScreen, MinerListScreen, DetailScreen
-from web.server import SharedState, run_server
+from history import HistoryStore
+from scanner import miner_key
+from worker import start_scan_workers
+from web.state import SharedState
 
 
 def _setup_display_for_spi_tft() -> None:
@@ -26,68 +31,89 @@ def _setup_display_for_spi_tft() -> None:
         os.putenv("SDL_FBDEV", os.environ.get("SDL_FBDEV", "/dev/fb0"))
 
 
+def _start_web_server(shared_state: SharedState) -> None:
+    """Import Flask and serve scan results (runs in a background thread)."""
+    from web.server import run_server
+
+    run_server(shared_state, host="0.0.0.0", port=WEB_PORT)
+
+
+def _preload_scanner() -> None:
+    """Import pyasic in the background so the first scan does not pay for it."""
+    try:
+        from scanner import preload
+
+        preload()
+    except Exception:
+        pass
+
+
+def _report_startup_time() -> None:
+    """Log time from process start to first frame against STARTUP_BUDGET_MS."""
+    elapsed_ms = (time.perf_counter() - _START) * 1000
+    if elapsed_ms > STARTUP_BUDGET_MS:
+        print(f"Startup: first frame after {elapsed_ms:.0f} ms (budget {STARTUP_BUDGET_MS} ms exceeded)", file=sys.stderr)
+    else:
+        print(f"Startup: first frame after {elapsed_ms:.0f} ms", file=sys.stderr)
+
+
 def main() -> None:
     _setup_display_for_spi_tft()
-    pygame.init()
+    # Only the subsystems we use; pygame.init() also probes audio/joystick
+    pygame.display.init()
+    pygame.font.init()
     pygame.mouse.set_visible(True)
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
     pygame.display.set_caption("Miner Scanner")
     clock = pygame.time.Clock()
 
-    miners: list[dict] = []
-    scan_thread: threading.Thread | None = None
-    shared_state = SharedState()
-
-    def do_scan() -> None:
-        nonlocal miners, scan_thread
-        shared_state.set_scanning(True)
-        home.set_scanning(True)
-        try:
-            miners = run_scan(SUBNET)
-            shared_state.set_miners(miners)
-        except Exception:
-            miners = []
-            shared_state.set_miners([])
-        finally:
-            shared_state.set_scanning(False)
-            shared_state.set_last_scan(datetime.now().strftime("%H:%M:%S"))
-            home.set_scanning(False)
-            home.set_last_scan(datetime.now().strftime("%H:%M:%S"))
-            home.set_miners(miners)
+    shared_state = SharedState(history=HistoryStore(HISTORY_FILE, HISTORY_MAX_BYTES) if HISTORY_FILE else None)
+    # Last SharedState version shown; diffs are applied in version order
+    seen_version = 0
+
+    def apply_changes() -> None:
+        """Propagate scan deltas published since the last frame to the screens (UI thread only)."""
+        nonlocal seen_version
+        version, diffs = shared_state.get_changes(seen_version)
+        if diffs is None:
+            # Fell behind the retained changes: reload in full
+            miners, _, _, version = shared_state.get_snapshot()
             list_screen.set_miners(miners)
-
-    # Start web server in background
-    web_thread = threading.Thread(
-        target=run_server,
-        args=(shared_state,),
-        kwargs={"host": "0.0.0.0", "port": WEB_PORT},
-        daemon=True,
-    )
-    web_thread.start()
+            if detail_screen:
+                key = miner_key(detail_screen.data)
+                detail_screen.apply_diff({
+                    "added": [],
+                    "removed": [],
+                    "changed": [{"key": key, "miner": m, "fields": {}} for m in miners if miner_key(m) == key],
+                })
+        for diff in diffs or []:
+            list_screen.apply_diff(diff)
+            if detail_screen:
+                detail_screen.apply_diff(diff)
+        if version != seen_version:
+            seen_version = version
+            home.set_miners(list_screen.miners)
 
     home = HomeScreen(on_scan=lambda: None)
     list_screen = MinerListScreen([], on_select=lambda d: None, on_back=lambda: None)
     detail_screen: DetailScreen | None = None
 
     def on_scan_click() -> None:
-        nonlocal scan_thread
-        if scan_thread and scan_thread.is_alive():
-            return
-        scan_thread = threading.Thread(target=do_scan, daemon=True)
-        scan_thread.start()
-
-    def maybe_scan_from_web() -> None:
-        """Trigger scan if web server requested one."""
-        nonlocal scan_thread
-        if shared_state.consume_scan_request():
-            if not (scan_thread and scan_thread.is_alive()):
-                scan_thread = threading.Thread(target=do_scan, daemon=True)
-                scan_thread.start()
+        shared_state.request_scan()
+
+    def on_cancel_click() -> None:
+        shared_state.cancel_scans()
 
     def on_select_miner(data: dict) -> None:
         nonlocal detail_screen
-        detail_screen = DetailScreen(data, on_back=lambda: None)
+        ip = data.get("ip", "")
+        detail_screen = DetailScreen(
+            data,
+            on_back=lambda: None,
+            alerts=shared_state.get_alerts(miner_key(data)),
+            on_refresh=(lambda: shared_state.request_refresh(ip)) if ip else None,
+        )
 
     def on_back_from_list() -> None:
         pass
@@ -96,14 +122,28 @@ def main() -> None:
         pass
 
     home.on_scan = on_scan_click
+    home.on_cancel = on_cancel_click
     list_screen.on_select = on_select_miner
     list_screen.on_back = on_back_from_list
 
     current_screen: str = "home"
     running = True
+    first_frame = True
+    fleet_revision = -1
+    alerts_revision = -1
 
     while running:
-        maybe_scan_from_web()
+        apply_changes()
+        home.set_scanning(shared_state.scanning)
+        home.set_last_scan(shared_state.last_scan)
+        if shared_state.fleet.revision != fleet_revision:
+            fleet_revision = shared_state.fleet.revision
+            home.set_summary(shared_state.get_summary())
+        if shared_state.alerts.revision != alerts_revision:
+            alerts_revision = shared_state.alerts.revision
+            home.set_alert_count(shared_state.alerts.count)
+            if detail_screen:
+                detail_screen.set_alerts(shared_state.get_alerts(miner_key(detail_screen.data)))
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -140,6 +180,13 @@ def main() -> None:
             detail_screen.draw(screen)
 
         pygame.display.flip()
+        if first_frame:
+            # Heavy modules (Flask, pyasic) load only after the home screen is up
+            first_frame = False
+            _report_startup_time()
+            threading.Thread(target=_start_web_server, args=(shared_state,), daemon=True).start()
+            threading.Thread(target=_preload_scanner, daemon=True).start()
+            start_scan_workers(shared_state, SUBNET)
         clock.tick(30)
 
     pygame.quit()
@@ -0,0 +1,144 @@
+"""Prioritized scan job queue with coalescing of duplicate requests and cancellation."""
+
+import heapq
+import itertools
+import threading
+
+# Lower runs first
+PRIORITY_REFRESH = 0
+PRIORITY_SWEEP = 10
+
+
+def _job_key(subnet: str | None, ip: str | None) -> str:
+    """Requests with the same key are coalesced into one job."""
+    return f"miner:{ip}" if ip is not None else f"sweep:{subnet or ''}"
+
+
+class ScanJob:
+    """A full sweep of a subnet (ip is None) or a refresh of one miner."""
+
+    def __init__(self, job_id: int, subnet: str | None, ip: str | None, priority: int) -> None:
+        self.id = job_id
+        self.subnet = subnet
+        self.ip = ip
+        self.priority = priority
+        self.status = "pending"
+        self.cancel_event = threading.Event()
+
+    @property
+    def sweep(self) -> bool:
+        return self.ip is None
+
+    @property
+    def key(self) -> str:
+        return _job_key(self.subnet, self.ip)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": "sweep" if self.sweep else "refresh",
+            "target": self.ip if self.ip is not None else self.subnet or "default",
+            "priority": self.priority,
+            "status": self.status,
+        }
+
+
+class ScanQueue:
+    """
+    Thread-safe priority queue of ScanJobs consumed by scan workers.
+    A request matching a pending or running job returns that job instead of
+    queuing a duplicate. Only one sweep runs at a time; refreshes may run
+    alongside it on another worker, so they never wait for a sweep to finish.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, ScanJob]] = []
+        self._pending: dict[str, ScanJob] = {}
+        self._running: dict[str, ScanJob] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, subnet: str | None = None, ip: str | None = None, priority: int | None = None) -> ScanJob:
+        if priority is None:
+            priority = PRIORITY_REFRESH if ip is not None else PRIORITY_SWEEP
+        key = _job_key(subnet, ip)
+        with self._cond:
+            running = self._running.get(key)
+            if running is not None and not running.cancel_event.is_set():
+                return running
+            pending = self._pending.get(key)
+            if pending is not None:
+                if priority < pending.priority:
+                    # Older heap entry becomes stale and is skipped in get()
+                    pending.priority = priority
+                    heapq.heappush(self._heap, (priority, pending.id, pending))
+                    self._cond.notify_all()
+                return pending
+            job = ScanJob(next(self._ids), subnet, ip, priority)
+            self._pending[key] = job
+            heapq.heappush(self._heap, (priority, job.id, job))
+            self._cond.notify_all()
+            return job
+
+    def _pop_runnable(self) -> ScanJob | None:
+        sweep_running = any(j.sweep for j in self._running.values())
+        held: list[tuple[int, int, ScanJob]] = []
+        found = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            priority, _, job = entry
+            if self._pending.get(job.key) is not job or priority != job.priority:
+                continue
+            if job.sweep and sweep_running:
+                held.append(entry)
+                continue
+            found = job
+            break
+        for entry in held:
+            heapq.heappush(self._heap, entry)
+        return found
+
+    def get(self) -> ScanJob:
+        """Block until a job can run, mark it running and return it."""
+        with self._cond:
+            while True:
+                job = self._pop_runnable()
+                if job is not None:
+                    del self._pending[job.key]
+                    self._running[job.key] = job
+                    job.status = "running"
+                    return job
+                self._cond.wait()
+
+    def done(self, job: ScanJob, status: str = "done") -> None:
+        with self._cond:
+            if self._running.get(job.key) is job:
+                del self._running[job.key]
+            job.status = "cancelled" if job.cancel_event.is_set() else status
+            self._cond.notify_all()
+
+    def cancel(self, job_id: int | None = None) -> int:
+        """Cancel one job by id, or every pending and running job. Returns how many."""
+        with self._cond:
+            count = 0
+            for key, job in list(self._pending.items()):
+                if job_id is None or job.id == job_id:
+                    del self._pending[key]
+                    job.cancel_event.set()
+                    job.status = "cancelled"
+                    count += 1
+            for job in self._running.values():
+                if (job_id is None or job.id == job_id) and not job.cancel_event.is_set():
+                    job.cancel_event.set()
+                    # Until the worker stops; done() then reports "cancelled"
+                    job.status = "cancelling"
+                    count += 1
+            return count
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            pending = sorted(self._pending.values(), key=lambda j: (j.priority, j.id))
+            return {
+                "running": [j.to_dict() for j in self._running.values()],
+                "pending": [j.to_dict() for j in pending],
+            }
@@ -1,16 +1,26 @@
-"""Async scan logic using pyasic for discovering miners on the LAN."""
+"""Async scan logic using pyasic for discovering miners on the LAN.
 
-import asyncio
-from typing import Any
+pyasic is imported on first scan, not at module import, so importing this
+module stays cheap during startup.
+"""
 
-from pyasic.network import MinerNetwork
-from pyasic import settings
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable
 
 from config import SUBNET, WHATSMINER_PASSWORD
 
 
+def preload() -> None:
+    """Import pyasic ahead of the first scan (e.g. from a background thread)."""
+    import pyasic.network  # noqa: F401
+
+
 def _configure_pyasic() -> None:
     """Set Whatsminer password and other pyasic settings."""
+    from pyasic import settings
+
     settings.update("default_whatsminer_rpc_password", WHATSMINER_PASSWORD)
 
 
@@ -44,31 +54,78 @@ def _extract_workers(miner_data: Any) -> list[tuple[str, str]]:
     return workers
 
 
-async def scan_network(subnet: str | None = None) -> list[dict]:
+class ScanCancelled(Exception):
+    """Raised when a scan is stopped through its cancel event."""
+
+
+async def _cancellable(aw: Awaitable, cancel: threading.Event | None) -> Any:
+    """Await aw, polling the cancel event so long awaits can be abandoned."""
+    if cancel is None:
+        return await aw
+    task = asyncio.ensure_future(aw)
+    while not task.done():
+        if cancel.is_set():
+            task.cancel()
+            raise ScanCancelled()
+        await asyncio.wait({task}, timeout=0.25)
+    return task.result()
+
+
+async def scan_network(
+    subnet: str | None = None,
+    on_result: Callable[[dict, float], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[dict]:
     """
     Scan the LAN for miners and return a list of miner data dicts.
     Each dict contains all MinerData fields plus extracted workers.
+    If given, on_result is called with each miner dict as soon as it is read,
+    along with the time.monotonic() at which the read started.
+    Setting cancel stops the scan with ScanCancelled; results already passed to
+    on_result stay with the caller.
     """
+    from pyasic.network import MinerNetwork
+
     _configure_pyasic()
     net = subnet or SUBNET
     network = MinerNetwork.from_subnet(net)
-    miners = await network.scan()
+    miners = await _cancellable(network.scan(), cancel)
 
     results: list[dict] = []
     for miner in miners:
         if miner is None:
             continue
+        read_at = time.monotonic()
         try:
-            data = await miner.get_data()
+            data = await _cancellable(miner.get_data(), cancel)
             if data is None:
                 continue
             workers = _extract_workers(data)
-            results.append(_miner_data_to_dict(data, workers))
+            result = _miner_data_to_dict(data, workers)
+        except ScanCancelled:
+            raise
         except Exception:
             continue
+        results.append(result)
+        if on_result is not None:
+            on_result(result, read_at)
     return results
 
 
+def _num(v: Any) -> float | None:
+    """Numeric value of a pyasic field (float, AlgoHashRate, or "12.3 TH/s")."""
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(str(v).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
 def _miner_data_to_dict(data: Any, workers: list[tuple[str, str]]) -> dict:
     """Convert MinerData to a flat dict for GUI display."""
     def _fmt(v: Any) -> str:
@@ -79,10 +136,12 @@ def _miner_data_to_dict(data: Any, workers: list[tuple[str, str]]) -> dict:
         return str(v)
 
     hashboards_info = []
+    temps = [_num(getattr(data, "temperature_avg", None))]
     for hb in getattr(data, "hashboards", []) or []:
         hr = getattr(hb, "hashrate", None)
         temp = getattr(hb, "temperature", None)
         chips = getattr(hb, "chips", None)
+        temps.append(_num(temp))
         hashboards_info.append({
             "hashrate": _fmt(hr),
             "temp": _fmt(temp),
@@ -90,9 +149,11 @@ def _miner_data_to_dict(data: Any, workers: list[tuple[str, str]]) -> dict:
         })
 
     fans_info = []
+    fan_speeds = []
     for f in getattr(data, "fans", []) or []:
         speed = getattr(f, "speed", None)
         fans_info.append({"speed": _fmt(speed)})
+        fan_speeds.append(_num(speed))
 
     errors_list = []
     for e in getattr(data, "errors", []) or []:
@@ -100,6 +161,7 @@ def _miner_data_to_dict(data: Any, workers: list[tuple[str, str]]) -> dict:
 
     return {
         "ip": getattr(data, "ip", ""),
+        "mac": _fmt(getattr(data, "mac", None)),
         "hostname": _fmt(getattr(data, "hostname", None)),
         "model": _fmt(getattr(data, "model", None)),
         "make": _fmt(getattr(data, "make", None)),
@@ -117,9 +179,88 @@ def _miner_data_to_dict(data: Any, workers: list[tuple[str, str]]) -> dict:
         "fans": fans_info,
         "workers": workers,
         "errors": errors_list,
+        # Parsed numbers for aggregates and alerts (None when not reported)
+        "metrics": {
+            "hashrate": _num(getattr(data, "hashrate", None)),
+            "expected_hashrate": _num(getattr(data, "expected_hashrate", None)),
+            "wattage": _num(getattr(data, "wattage", None)),
+            "temp_max": max((t for t in temps if t is not None), default=None),
+            "fan_min": min((f for f in fan_speeds if f is not None), default=None),
+        },
     }
 
 
-def run_scan(subnet: str | None = None) -> list[dict]:
+def miner_key(miner: dict) -> str:
+    """Identity of a miner across scans: MAC address when known, else IP."""
+    return miner.get("mac") or miner.get("ip", "")
+
+
+def _field_changed(name: str, old: Any, new: Any) -> bool:
+    if name == "uptime":
+        # Grows on every read; only a drop (reboot) is a change worth reporting
+        try:
+            return float(new) < float(old)
+        except (TypeError, ValueError):
+            return (old is None) != (new is None)
+    return old != new
+
+
+def diff_miners(previous: list[dict], current: list[dict]) -> dict:
+    """
+    Compare two scan results keyed by miner_key.
+    Returns {"added": [miner], "removed": [miner], "changed": [change]} where each
+    change is {"key": ..., "miner": new dict, "fields": {name: [old, new]}}.
+    Unchanged miners are omitted; uptime only counts when it goes backwards.
+    """
+    old_by_key = {miner_key(m): m for m in previous}
+    added: list[dict] = []
+    changed: list[dict] = []
+    seen: set[str] = set()
+    for miner in current:
+        key = miner_key(miner)
+        seen.add(key)
+        old = old_by_key.get(key)
+        if old is None:
+            added.append(miner)
+            continue
+        fields = {
+            name: [old.get(name), value]
+            for name, value in miner.items()
+            if _field_changed(name, old.get(name), value)
+        }
+        if fields:
+            changed.append({"key": key, "miner": miner, "fields": fields})
+    removed = [m for k, m in old_by_key.items() if k not in seen]
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def is_empty_diff(diff: dict) -> bool:
+    return not (diff["added"] or diff["removed"] or diff["changed"])
+
+
+async def scan_miner(ip: str) -> dict | None:
+    """Read a single miner by IP; None if nothing answers there."""
+    from pyasic import get_miner
+
+    _configure_pyasic()
+    miner = await get_miner(ip)
+    if miner is None:
+        return None
+    data = await miner.get_data()
+    if data is None:
+        return None
+    return _miner_data_to_dict(data, _extract_workers(data))
+
+
+def run_scan(
+    subnet: str | None = None,
+    on_result: Callable[[dict, float], None] | None = None,
+    cancel: threading.Event | None = None,
+) -> list[dict]:
     """Synchronous wrapper for scan_network (for use from non-async code)."""
-    return asyncio.run(scan_network(subnet))
+    return asyncio.run(scan_network(subnet, on_result, cancel))
+
+
+def refresh_miner(ip: str) -> dict | None:
+    """Synchronous wrapper for scan_miner."""
+    return asyncio.run(scan_miner(ip))
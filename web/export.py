@@ -0,0 +1,81 @@
+"""Lazy row generators for CSV/NDJSON exports (one row in memory at a time)."""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+from scanner import miner_key
+
+MINER_COLUMNS = [
+    "ip",
+    "mac",
+    "hostname",
+    "make",
+    "model",
+    "firmware",
+    "hashrate",
+    "expected_hashrate",
+    "wattage",
+    "efficiency",
+    "temperature_avg",
+    "env_temp",
+    "uptime",
+    "is_mining",
+    "workers",
+    "errors",
+]
+
+HISTORY_COLUMNS = ["time", "version", "change", "key", "ip", "field", "old", "new"]
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def csv_lines(header: list[str], rows: Iterable[list]) -> Iterator[str]:
+    """Yield a CSV header and rows as text, reusing one small buffer."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    yield buf.getvalue()
+    for row in rows:
+        buf.seek(0)
+        buf.truncate(0)
+        writer.writerow([_cell(v) for v in row])
+        yield buf.getvalue()
+
+
+def ndjson_lines(items: Iterable[dict]) -> Iterator[str]:
+    for item in items:
+        yield json.dumps(item, default=str) + "\n"
+
+
+def miner_rows(miners: Iterable[dict]) -> Iterator[list]:
+    for m in miners:
+        row = []
+        for col in MINER_COLUMNS:
+            value = m.get(col)
+            if col == "workers":
+                value = ";".join(user for _, user in value or [] if user)
+            elif col == "errors":
+                value = ";".join(str(e) for e in value or [])
+            row.append(value)
+        yield row
+
+
+def history_rows(records: Iterable[dict]) -> Iterator[list]:
+    """Flatten history records into one row per added/removed miner or changed field."""
+    for r in records:
+        when, version = r.get("time", ""), r.get("version", "")
+        for m in r.get("added", []):
+            yield [when, version, "added", miner_key(m), m.get("ip", ""), "", "", ""]
+        for m in r.get("removed", []):
+            yield [when, version, "removed", m.get("key", ""), m.get("ip", ""), "", "", ""]
+        for c in r.get("changed", []):
+            for field, (old, new) in c.get("fields", {}).items():
+                yield [when, version, "changed", c.get("key", ""), c.get("ip", ""), field, old, new]
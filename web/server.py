@@ -1,54 +1,52 @@
 """Flask web server for viewing miner scan results."""
 
-import threading
-from flask import Flask, render_template, redirect, url_for, jsonify
+import ipaddress
+from typing import Iterator
 
-app = Flask(__name__)
+from flask import Flask, Response, abort, render_template, redirect, request, stream_with_context, url_for, jsonify
 
+from web.export import HISTORY_COLUMNS, MINER_COLUMNS, csv_lines, history_rows, miner_rows, ndjson_lines
+from web.state import SharedState
 
-class SharedState:
-    """Thread-safe shared state between GUI and web server."""
+app = Flask(__name__)
 
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self.miners: list[dict] = []
-        self.last_scan: str | None = None
-        self.scanning = False
-        self.scan_requested = False
 
-    def get_snapshot(self) -> tuple[list[dict], str | None, bool]:
-        with self._lock:
-            return (list(self.miners), self.last_scan, self.scanning)
+def _serialize(m: dict) -> dict:
+    """Miner dict as JSON-friendly dict (workers as url/user objects)."""
+    m2 = dict(m)
+    workers = m2.get("workers") or []
+    m2["workers"] = [{"url": u, "user": ur} for u, ur in workers]
+    return m2
 
-    def set_miners(self, miners: list[dict]) -> None:
-        with self._lock:
-            self.miners = miners
 
-    def set_last_scan(self, when: str | None) -> None:
-        with self._lock:
-            self.last_scan = when
+def _serialize_diff(diff: dict) -> dict:
+    return {
+        "added": [_serialize(m) for m in diff["added"]],
+        "removed": [m.get("ip", "") for m in diff["removed"]],
+        "changed": [
+            {"ip": c["miner"].get("ip", ""), "miner": _serialize(c["miner"]), "fields": sorted(c["fields"])}
+            for c in diff["changed"]
+        ],
+    }
 
-    def set_scanning(self, scanning: bool) -> None:
-        with self._lock:
-            self.scanning = scanning
 
-    def request_scan(self) -> bool:
-        with self._lock:
-            if self.scanning:
-                return False
-            self.scan_requested = True
-            return True
+def _valid_ip(ip: object) -> str | None:
+    """Normalized IP address, or None if `ip` is not one (hostnames are refused)."""
+    if not isinstance(ip, str):
+        return None
+    try:
+        return str(ipaddress.ip_address(ip.strip()))
+    except ValueError:
+        return None
 
-    def consume_scan_request(self) -> bool:
-        with self._lock:
-            if self.scan_requested:
-                self.scan_requested = False
-                return True
-            return False
 
-    def clear_scan_request(self) -> None:
-        with self._lock:
-            self.scan_requested = False
+def _stream(lines: Iterator[str], mimetype: str, filename: str) -> Response:
+    """Streamed download; rows are generated while the response is sent."""
+    return Response(
+        stream_with_context(lines),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
 
 def create_app(shared_state: SharedState) -> Flask:
@@ -56,31 +54,129 @@ def create_app(shared_state: SharedState) -> Flask:
 
     @app.route("/")
     def index() -> str:
-        miners, last_scan, scanning = shared_state.get_snapshot()
-        return render_template("index.html", miners=miners, last_scan=last_scan, scanning=scanning)
+        miners, last_scan, scanning, version = shared_state.get_snapshot()
+        return render_template(
+            "index.html",
+            miners=miners,
+            last_scan=last_scan,
+            scanning=scanning,
+            version=version,
+            summary=shared_state.get_summary(),
+            summary_rev=shared_state.fleet.revision,
+            alerts=shared_state.get_alerts(),
+            alerts_rev=shared_state.alerts.revision,
+        )
 
     @app.route("/api/miners")
     def api_miners() -> tuple:
-        miners, last_scan, scanning = shared_state.get_snapshot()
-
-        def _serialize(m: dict) -> dict:
-            m2 = dict(m)
-            workers = m2.get("workers") or []
-            m2["workers"] = [{"url": u, "user": ur} for u, ur in workers]
-            return m2
-
+        miners, last_scan, scanning, version = shared_state.get_snapshot()
         return jsonify({
             "miners": [_serialize(m) for m in miners],
             "last_scan": last_scan,
             "scanning": scanning,
+            "version": version,
         })
 
+    @app.route("/api/changes")
+    def api_changes() -> tuple:
+        """
+        Diffs since ?since=<version>; "reset": true means reload /api/miners.
+        Summary and alerts are included only when their revision differs from
+        ?summary_rev= / ?alerts_rev=, so an idle poll stays constant-size.
+        """
+        since = request.args.get("since", default=0, type=int)
+        version, diffs = shared_state.get_changes(since)
+        payload = {
+            "version": version,
+            "reset": diffs is None,
+            "changes": [_serialize_diff(d) for d in diffs or []],
+            "last_scan": shared_state.last_scan,
+            "scanning": shared_state.scanning,
+        }
+        summary_rev = shared_state.fleet.revision
+        if request.args.get("summary_rev", default=-1, type=int) != summary_rev:
+            payload["summary"] = shared_state.get_summary()
+            payload["summary_rev"] = summary_rev
+        alerts_rev = shared_state.alerts.revision
+        if request.args.get("alerts_rev", default=-1, type=int) != alerts_rev:
+            payload["alerts"] = shared_state.get_alerts()
+            payload["alerts_rev"] = alerts_rev
+        return jsonify(payload)
+
+    @app.route("/api/summary")
+    def api_summary() -> tuple:
+        """Fleet totals, maintained incrementally by SharedState.fleet."""
+        return jsonify(shared_state.get_summary())
+
+    @app.route("/api/alerts")
+    def api_alerts() -> tuple:
+        """Active alerts, optionally for one miner via ?ip=<ip>."""
+        alerts = shared_state.get_alerts()
+        ip = request.args.get("ip")
+        if ip:
+            alerts = [a for a in alerts if a["ip"] == ip]
+        return jsonify({"alerts": alerts, "count": len(alerts)})
+
+    @app.route("/export/miners.<fmt>")
+    def export_miners(fmt: str) -> Response:
+        """Current snapshot as CSV or NDJSON."""
+        miners, _, _, _ = shared_state.get_snapshot()
+        if fmt == "csv":
+            return _stream(csv_lines(MINER_COLUMNS, miner_rows(miners)), "text/csv", "miners.csv")
+        if fmt == "ndjson":
+            return _stream(ndjson_lines(_serialize(m) for m in miners), "application/x-ndjson", "miners.ndjson")
+        abort(404)
+
+    @app.route("/export/history.<fmt>")
+    def export_history(fmt: str) -> Response:
+        """Scan history as CSV or NDJSON, filtered by ?start=&end= (ISO time prefixes)."""
+        if shared_state.history is None or fmt not in ("csv", "ndjson"):
+            abort(404)
+        records = shared_state.history.iter_records(request.args.get("start"), request.args.get("end"))
+        if fmt == "csv":
+            return _stream(csv_lines(HISTORY_COLUMNS, history_rows(records)), "text/csv", "history.csv")
+        return _stream(ndjson_lines(records), "application/x-ndjson", "history.ndjson")
+
     @app.route("/scan", methods=["POST"])
     def trigger_scan() -> tuple:
-        if shared_state.request_scan():
-            return redirect(url_for("index"), code=302)
+        shared_state.request_scan()
         return redirect(url_for("index"), code=302)
 
+    @app.route("/scan/miner/<ip>", methods=["POST"])
+    def trigger_refresh(ip: str) -> tuple:
+        """Refresh one miner; runs ahead of (and alongside) full sweeps."""
+        ip = _valid_ip(ip)
+        if ip is None:
+            abort(400)
+        shared_state.request_refresh(ip)
+        return redirect(url_for("index"), code=302)
+
+    @app.route("/scan/cancel", methods=["POST"])
+    def cancel_scan() -> tuple:
+        shared_state.cancel_scans()
+        return redirect(url_for("index"), code=302)
+
+    @app.route("/api/scans", methods=["GET", "POST"])
+    def api_scans() -> tuple:
+        """GET: running and queued jobs. POST {"ip": ...} or {} queues a job."""
+        if request.method == "POST":
+            body = request.get_json(silent=True) or {}
+            if "ip" in body:
+                ip = _valid_ip(body["ip"])
+                if ip is None:
+                    abort(400)
+                job = shared_state.request_refresh(ip)
+            else:
+                job = shared_state.request_scan()
+            return jsonify(job.to_dict()), 202
+        return jsonify(shared_state.scan_queue.snapshot())
+
+    @app.route("/api/scans/<int:job_id>", methods=["DELETE"])
+    def api_cancel_scan(job_id: int) -> tuple:
+        if not shared_state.cancel_scans(job_id):
+            abort(404)
+        return jsonify({"cancelled": job_id})
+
     return app
 
 
@@ -0,0 +1,185 @@
+"""Shared state between GUI, scanner and web server (no Flask import)."""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from alerts import AlertEngine
+from fleet import FleetStats
+from history import HistoryStore
+from scan_queue import ScanJob, ScanQueue
+from scanner import diff_miners, is_empty_diff, miner_key
+
+# Number of recent scan diffs kept for /api/changes
+MAX_CHANGES = 50
+
+
+class SharedState:
+    """Thread-safe shared state between GUI and web server."""
+
+    def __init__(self, history: HistoryStore | None = None) -> None:
+        self._lock = threading.Lock()
+        self.history = history
+        self._by_key: dict[str, dict] = {}
+        # time.monotonic() at which each miner's current data was read
+        self._read_at: dict[str, float] = {}
+        self.version = 0
+        self.fleet = FleetStats()
+        self.alerts = AlertEngine()
+        self._changes: deque[tuple[int, dict]] = deque(maxlen=MAX_CHANGES)
+        self.last_scan: str | None = None
+        self.scanning = False
+        self.scan_queue = ScanQueue()
+
+    @property
+    def miners(self) -> list[dict]:
+        """Latest result of every known miner, in discovery order."""
+        return list(self._by_key.values())
+
+    def get_snapshot(self) -> tuple[list[dict], str | None, bool, int]:
+        """(miners, last_scan, scanning, version); version is that of the miners returned."""
+        with self._lock:
+            return (list(self._by_key.values()), self.last_scan, self.scanning, self.version)
+
+    def get_summary(self) -> dict:
+        with self._lock:
+            return self.fleet.summary()
+
+    def get_alerts(self, key: str | None = None) -> list[dict]:
+        """Active alerts, for one miner (by miner_key) or the whole fleet."""
+        with self._lock:
+            return self.alerts.for_miner(key) if key is not None else self.alerts.all()
+
+    def begin_sweep(self) -> dict:
+        """Start collecting a sweep; pass the result to add_result and finish_sweep."""
+        return {
+            "started": time.monotonic(),
+            "seen": set(),
+            # miner_key -> read_at of the result this sweep applied
+            "read_at": {},
+            "diff": {"added": [], "removed": [], "changed": []},
+        }
+
+    def add_result(self, miner: dict, read_at: float, sweep: dict | None = None) -> dict:
+        """
+        Fold one miner result into miners, fleet stats and alerts as soon as it
+        is read; each result is evaluated exactly once. Returns its diff. Within
+        a sweep the diff is collected and published by finish_sweep; otherwise
+        (a single-miner refresh) it is published right away.
+        A result read before the data already held (read_at, from
+        time.monotonic()) is ignored, so a slow sweep cannot revert a newer
+        refresh of the same miner.
+        """
+        key = miner_key(miner)
+        with self._lock:
+            if sweep is not None:
+                sweep["seen"].add(key)
+            if read_at < self._read_at.get(key, float("-inf")):
+                return {"added": [], "removed": [], "changed": []}
+            self._read_at[key] = read_at
+            old = self._by_key.get(key)
+            diff = diff_miners([old] if old is not None else [], [miner])
+            self._apply(diff)
+            if sweep is not None:
+                sweep["read_at"][key] = read_at
+                sweep["diff"]["added"].extend(diff["added"])
+                sweep["diff"]["changed"].extend(diff["changed"])
+                return diff
+            self._publish(diff)
+        return diff
+
+    def finish_sweep(self, sweep: dict, complete: bool) -> dict:
+        """
+        Publish a sweep's changes as one diff. Only a complete sweep removes
+        miners it did not see (and that were not refreshed since it started);
+        a cancelled or failed one keeps them, since their absence proves nothing.
+        Entries superseded by a refresh published meanwhile are dropped (or, for
+        added miners, carry the newer data) so consumers never end on old data.
+        """
+        with self._lock:
+            diff = self._drop_superseded(sweep)
+            if complete:
+                removed = [
+                    m for k, m in self._by_key.items()
+                    if k not in sweep["seen"] and self._read_at.get(k, 0.0) < sweep["started"]
+                ]
+                self._apply({"added": [], "removed": removed, "changed": []})
+                diff["removed"].extend(removed)
+            self._publish(diff)
+        return diff
+
+    def _drop_superseded(self, sweep: dict) -> dict:
+        """Sweep diff without readings older than the data now held (caller holds _lock)."""
+
+        def superseded(key: str) -> bool:
+            return self._read_at.get(key, float("-inf")) > sweep["read_at"].get(key, float("-inf"))
+
+        diff = sweep["diff"]
+        # An added miner stays added (the refresh's diff reported it as changed),
+        # but with the data the refresh read
+        added = [self._by_key.get(miner_key(m), m) if superseded(miner_key(m)) else m for m in diff["added"]]
+        changed = [c for c in diff["changed"] if not superseded(c["key"])]
+        return {"added": added, "removed": list(diff["removed"]), "changed": changed}
+
+    def _apply(self, diff: dict) -> None:
+        """Apply a diff to miners, fleet stats and alerts (caller holds _lock)."""
+        for m in diff["removed"]:
+            key = miner_key(m)
+            self._by_key.pop(key, None)
+            self._read_at.pop(key, None)
+            self.fleet.remove(key)
+            self.alerts.remove(key)
+        for change in diff["changed"]:
+            self._by_key[change["key"]] = change["miner"]
+            self.fleet.update(change["miner"])
+            self.alerts.evaluate(change["miner"])
+        for m in diff["added"]:
+            self._by_key[miner_key(m)] = m
+            self.fleet.update(m)
+            self.alerts.evaluate(m)
+
+    def _publish(self, diff: dict) -> None:
+        """
+        Version a non-empty diff for get_changes and append it to history
+        (caller holds _lock, so history lines are written in version order).
+        """
+        if is_empty_diff(diff):
+            return
+        self.version += 1
+        self._changes.append((self.version, diff))
+        if self.history is not None:
+            self.history.record(self.version, datetime.now().isoformat(timespec="seconds"), diff)
+
+    def get_changes(self, since: int) -> tuple[int, list[dict] | None]:
+        """
+        Return (version, diffs newer than `since`). Diffs is None when `since`
+        is older than the retained changes and the caller must reload in full.
+        """
+        with self._lock:
+            if since == self.version:
+                return self.version, []
+            if since > self.version or not self._changes or self._changes[0][0] > since + 1:
+                return self.version, None
+            return self.version, [d for v, d in self._changes if v > since]
+
+    def set_last_scan(self, when: str | None) -> None:
+        with self._lock:
+            self.last_scan = when
+
+    def set_scanning(self, scanning: bool) -> None:
+        with self._lock:
+            self.scanning = scanning
+
+    def request_scan(self, subnet: str | None = None) -> ScanJob:
+        """Queue a full sweep (default subnet if None); duplicates are coalesced."""
+        return self.scan_queue.submit(subnet=subnet)
+
+    def request_refresh(self, ip: str) -> ScanJob:
+        """Queue a single-miner refresh ahead of any pending sweep."""
+        if not ip:
+            raise ValueError("refresh needs a miner IP")
+        return self.scan_queue.submit(ip=ip)
+
+    def cancel_scans(self, job_id: int | None = None) -> int:
+        return self.scan_queue.cancel(job_id)
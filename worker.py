@@ -0,0 +1,84 @@
+"""Scan worker threads consuming SharedState.scan_queue."""
+
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+from scan_queue import ScanJob
+from web.state import SharedState
+
+# Two workers: one can sit in a multi-minute sweep while the other serves refreshes
+WORKER_COUNT = 2
+
+
+def _run_sweep(shared_state: SharedState, job: ScanJob, subnet: str) -> tuple[str, dict]:
+    """Scan a subnet, folding each result in as it is read. Returns (status, diff)."""
+    from scanner import ScanCancelled, run_scan
+
+    sweep = shared_state.begin_sweep()
+    status = "failed"
+    try:
+        run_scan(
+            job.subnet or subnet,
+            on_result=lambda miner, read_at: shared_state.add_result(miner, read_at, sweep),
+            cancel=job.cancel_event,
+        )
+        status = "done"
+    except ScanCancelled:
+        status = "cancelled"
+    except Exception:
+        pass
+    # Results read before a cancel or failure are kept; removals need a full sweep
+    return status, shared_state.finish_sweep(sweep, complete=status == "done")
+
+
+def _run_refresh(shared_state: SharedState, job: ScanJob) -> tuple[str, dict | None]:
+    from scanner import refresh_miner
+
+    read_at = time.monotonic()
+    try:
+        miner = refresh_miner(job.ip)
+    except Exception:
+        return "failed", None
+    if job.cancel_event.is_set():
+        return "cancelled", None
+    if miner is None:
+        return "done", None
+    return "done", shared_state.add_result(miner, read_at)
+
+
+def _worker(shared_state: SharedState, subnet: str, on_done: Callable[[ScanJob, dict | None], None] | None) -> None:
+    while True:
+        job = shared_state.scan_queue.get()
+        status, diff = "failed", None
+        try:
+            if job.sweep:
+                shared_state.set_scanning(True)
+                try:
+                    status, diff = _run_sweep(shared_state, job, subnet)
+                finally:
+                    shared_state.set_scanning(False)
+                if status != "cancelled":
+                    shared_state.set_last_scan(datetime.now().strftime("%H:%M:%S"))
+            else:
+                status, diff = _run_refresh(shared_state, job)
+        finally:
+            shared_state.scan_queue.done(job, status)
+        if on_done is not None:
+            on_done(job, diff)
+
+
+def start_scan_workers(
+    shared_state: SharedState,
+    subnet: str,
+    on_done: Callable[[ScanJob, dict | None], None] | None = None,
+) -> None:
+    """
+    Start daemon workers. Sweeps without an explicit subnet scan `subnet`.
+    on_done(job, diff) is called from the worker thread after each job; a
+    cancelled or failed sweep still passes the changes it read before stopping.
+    diff is None for a refresh that failed, was cancelled or found nothing.
+    """
+    for _ in range(WORKER_COUNT):
+        threading.Thread(target=_worker, args=(shared_state, subnet, on_done), daemon=True).start()